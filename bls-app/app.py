@@ -1,12 +1,42 @@
+import hashlib
 import os
 from datetime import datetime
-
-from flask import Flask, Response, abort, send_from_directory, render_template_string
+from functools import lru_cache
+
+from flask import (
+    Flask,
+    Response,
+    abort,
+    jsonify,
+    request,
+    render_template_string,
+    send_from_directory,
+)
 
 app = Flask(__name__)
 
 # Root directory where files live
 BASE_DATA_DIR = os.path.abspath("data")
+PR_DIR = os.path.join(BASE_DATA_DIR, "pub", "time.series", "pr")
+
+# {file_path: (st_mtime_ns, st_size, md5)} so unchanged files are hashed once
+_MD5_CACHE = {}
+
+
+def file_md5(file_path: str, stat: os.stat_result) -> str:
+    """Return the MD5 of a file, reusing the cached value while it is unchanged."""
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _MD5_CACHE.get(file_path)
+    if cached and cached[:2] == signature:
+        return cached[2]
+
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            md5.update(chunk)
+
+    _MD5_CACHE[file_path] = (*signature, md5.hexdigest())
+    return md5.hexdigest()
 
 
 @app.route("/")
@@ -24,25 +54,37 @@ def index():
     return render_template_string(html)
 
 
-@app.route("/pub/time.series/pr/", defaults={"filename": None})
-@app.route("/pub/time.series/pr/<path:filename>")
-def pr_index(filename):
-    pr_dir = os.path.join(BASE_DATA_DIR, "pub", "time.series", "pr")
-
-    if not os.path.exists(pr_dir):
+@app.route("/pub/time.series/pr/index.json")
+def pr_index_json():
+    """Machine-readable listing: {filename: {size, mtime, md5}}."""
+    if not os.path.exists(PR_DIR):
         abort(404)
 
-    # Serve file
-    if filename:
-        file_path = os.path.join(pr_dir, filename)
-        if not os.path.isfile(file_path):
-            abort(404)
-        return send_from_directory(pr_dir, filename, as_attachment=False)
+    files = {}
+    for fname in sorted(os.listdir(PR_DIR)):
+        fpath = os.path.join(PR_DIR, fname)
+        if os.path.isfile(fpath):
+            stat = os.stat(fpath)
+            files[fname] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "md5": file_md5(fpath, stat),
+            }
+
+    return jsonify(files)
+
 
-    # Directory listing
+@lru_cache(maxsize=1)
+def _build_rows(dir_mtime_ns: int) -> tuple:
+    """
+    List (date, size, name) for each file in PR_DIR.
+
+    Keyed on the directory's mtime, which changes when files are added,
+    removed or atomically replaced, so repeat requests skip the stat calls.
+    """
     rows = []
-    for fname in sorted(os.listdir(pr_dir)):
-        fpath = os.path.join(pr_dir, fname)
+    for fname in sorted(os.listdir(PR_DIR)):
+        fpath = os.path.join(PR_DIR, fname)
         if os.path.isfile(fpath):
             stat = os.stat(fpath)
             mtime = datetime.fromtimestamp(stat.st_mtime)
@@ -59,6 +101,12 @@ def pr_index(filename):
             size = stat.st_size
             rows.append((date_str, size, fname))
 
+    return tuple(rows)
+
+
+@lru_cache(maxsize=1)
+def _render_listing(dir_mtime_ns: int) -> bytes:
+    """Render the HTML directory listing for PR_DIR, encoded once."""
     html = [
         "<html><head>",
         "<title>download.bls.gov - /pub/time.series/pr/</title>",
@@ -69,14 +117,37 @@ def pr_index(filename):
         '<A HREF="/pub/time.series/">[To Parent Directory]</A><br><br>',
     ]
 
-    for date, size, name in rows:
+    for date, size, name in _build_rows(dir_mtime_ns):
         html.append(
             f'{date:20} {size:10} <A HREF="/pub/time.series/pr/{name}">{name}</A><br>'
         )
 
     html.extend(["</pre><hr>", "</body></html>"])
 
-    return Response("\n".join(html), mimetype="text/html")
+    return "\n".join(html).encode("utf-8")
+
+
+@app.route("/pub/time.series/pr/", defaults={"filename": None})
+@app.route("/pub/time.series/pr/<path:filename>")
+def pr_index(filename):
+    if not os.path.exists(PR_DIR):
+        abort(404)
+
+    # Serve file
+    if filename:
+        file_path = os.path.join(PR_DIR, filename)
+        if not os.path.isfile(file_path):
+            abort(404)
+        # conditional: answer If-None-Match/If-Modified-Since with a 304
+        return send_from_directory(
+            PR_DIR, filename, as_attachment=False, conditional=True
+        )
+
+    # Directory listing (cached until the directory's mtime changes)
+    dir_mtime_ns = os.stat(PR_DIR).st_mtime_ns
+    response = Response(_render_listing(dir_mtime_ns), mimetype="text/html")
+    response.set_etag(str(dir_mtime_ns))
+    return response.make_conditional(request)
 
 
 if __name__ == "__main__":
@@ -1,18 +1,55 @@
+import base64
 import hashlib
+import html
 import json
 import os
-from io import BytesIO, StringIO
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import StringIO
+from tempfile import SpooledTemporaryFile
 from urllib.parse import urljoin
 
 import boto3
 import httpx
+import orjson
 import pandas as pd
-from bs4 import BeautifulSoup
+from botocore.exceptions import ClientError
 
 ROOT_URL = os.environ.get("BASE_URL", "http://bls-app:5000")
 BASE_PATH = "/pub/time.series/pr/"
 BASE_URL = urljoin(ROOT_URL.rstrip("/") + "/", BASE_PATH.lstrip("/"))
 
+# Number of BLS files downloaded/uploaded concurrently during a sync
+MAX_SYNC_WORKERS = 16
+# Streamed downloads are read in small chunks and only spill to disk past 8 MB
+STREAM_CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# An ETag of 32 hex digits is a single-part content MD5 (as S3 returns)
+MD5_HEX_RE = re.compile(r"[0-9a-fA-F]{32}")
+# Link targets in a directory listing; far cheaper than building a DOM
+HREF_RE = re.compile(rb'href="([^"]+)"', re.IGNORECASE)
+
+# Module-level clients and caches survive across warm Lambda invocations,
+# so service models, credentials and keep-alive connections are reused.
+_S3 = boto3.client(
+    "s3",
+    endpoint_url=os.environ.get("MINIO_ENDPOINT"),
+    aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+    aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
+    region_name=os.environ.get("AWS_REGION") or "us-east-1",
+)
+_HTTP = httpx.Client(
+    timeout=60,
+    limits=httpx.Limits(max_keepalive_connections=32),
+)
+
+BLS_LISTING_TTL_SECONDS = 60
+_bls_cache = {"ts": 0.0, "data": None}
+_population_cache = {"date": None}
+
 
 def create_s3_bucket_if_not_exists(s3_client, bucket_name) -> None:
     """Create an S3 bucket if it does not already exist."""
@@ -25,14 +62,10 @@ def create_s3_bucket_if_not_exists(s3_client, bucket_name) -> None:
         print(f"Bucket {bucket_name} created.")
 
 
-def md5_bytes(data: bytes) -> str:
-    return hashlib.md5(data).hexdigest()
-
-
 def load_bls_file(filename: str) -> pd.DataFrame:
     """Download and load a BLS flat file into a DataFrame."""
     url = BASE_URL + filename
-    r = httpx.get(url, timeout=30)
+    r = _HTTP.get(url, timeout=30)
     r.raise_for_status()
 
     df = pd.read_csv(StringIO(r.text), sep="\t")
@@ -43,15 +76,55 @@ def load_bls_file(filename: str) -> pd.DataFrame:
     return df
 
 
+def fetch_bls_index() -> dict | None:
+    """
+    Fetch the machine-readable index published by bls-app.
+
+    Returns:
+        {filename: {"url": download_url, "md5": content_md5}}, or None if
+        the server has no index.json (e.g. the real download.bls.gov)
+    """
+    r = _HTTP.get(BASE_URL + "index.json", timeout=30)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+
+    return {
+        filename: {"url": BASE_URL + filename, "md5": meta["md5"]}
+        for filename, meta in r.json().items()
+    }
+
+
 def list_bls_files() -> dict:
-    r = httpx.get(BASE_URL, timeout=30)
+    """
+    Returns:
+        {filename: {"url": download_url, "md5": content_md5_or_None}}
+    """
+    if (
+        _bls_cache["data"]
+        and time.monotonic() - _bls_cache["ts"] < BLS_LISTING_TTL_SECONDS
+    ):
+        return _bls_cache["data"]
+
+    files = fetch_bls_index()
+    if files is None:
+        files = list_bls_files_from_html()
+
+    _bls_cache["ts"] = time.monotonic()
+    _bls_cache["data"] = files
+
+    return files
+
+
+def list_bls_files_from_html() -> dict:
+    """Scrape the HTML directory listing; no checksums are available."""
+    r = _HTTP.get(BASE_URL, timeout=30)
     r.raise_for_status()
 
-    soup = BeautifulSoup(r.text, "html.parser")
     files = {}
 
-    for link in soup.find_all("a"):
-        href = link.get("href")
+    for match in HREF_RE.findall(r.content):
+        href = html.unescape(match.decode())
         # print("ROOT_URL:", ROOT_URL)
         # print("BASE_URL:", BASE_URL)
         # print("Resolved:", urljoin(ROOT_URL, href))
@@ -60,7 +133,7 @@ def list_bls_files() -> dict:
             continue
 
         filename = os.path.basename(href)
-        files[filename] = urljoin(ROOT_URL, href)
+        files[filename] = {"url": urljoin(ROOT_URL, href), "md5": None}
 
     return files
 
@@ -70,14 +143,13 @@ def list_bls_files_old() -> dict:
     Returns:
         {filename: download_url}
     """
-    r = httpx.get(BASE_URL, timeout=30)
+    r = _HTTP.get(BASE_URL, timeout=30)
     r.raise_for_status()
 
-    soup = BeautifulSoup(r.text, "html.parser")
     files = {}
 
-    for link in soup.find_all("a"):
-        href = link.get("href")
+    for match in HREF_RE.findall(r.content):
+        href = html.unescape(match.decode())
 
         # print("ROOT_URL:", ROOT_URL)
         # print("BASE_URL:", BASE_URL)
@@ -92,7 +164,7 @@ def list_bls_files_old() -> dict:
 def list_s3_objects(s3_client, bucket: str, prefix: str) -> dict:
     """
     Returns:
-        {filename: etag_without_quotes}
+        {filename: {"etag": etag_without_quotes, "last_modified": datetime}}
     """
     paginator = s3_client.get_paginator("list_objects_v2")
     result = {}
@@ -101,11 +173,24 @@ def list_s3_objects(s3_client, bucket: str, prefix: str) -> dict:
         for obj in page.get("Contents", []):
             key = obj["Key"]
             filename = key.replace(prefix, "", 1)
-            result[filename] = obj["ETag"].strip('"')
+            result[filename] = {
+                "etag": obj["ETag"].strip('"'),
+                "last_modified": obj["LastModified"],
+            }
 
     return result
 
 
+def head_s3_metadata(s3_client, bucket: str, key: str) -> dict | None:
+    """Return an object's user metadata, or None if the object does not exist."""
+    try:
+        return s3_client.head_object(Bucket=bucket, Key=key)["Metadata"]
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return None
+        raise
+
+
 def pull_population_data_to_s3(s3, bucket_name, prefix):
     """
     Fetch JSON data from API and upload it to S3 as a JSON file
@@ -118,24 +203,133 @@ def pull_population_data_to_s3(s3, bucket_name, prefix):
         "&measures=Population"
     )
 
-    # Fetch data from API
-    with httpx.Client(timeout=30.0) as client:
-        response = client.get(API_URL)
-        response.raise_for_status()
-        data = response.json()
-
     # Create S3 object key (e.g., prefix/data_2026-01-21.json)
     # timestamp = datetime.utcnow().strftime("%Y-%m-%d_%H-%M-%S")
     s3_key = f"{prefix.rstrip('/')}/honolulu_population_data.json"
 
+    # Validators of the API response the S3 copy was built from
+    metadata = head_s3_metadata(s3, bucket_name, s3_key)
+
+    # Already synced by this warm container today
+    today = datetime.now(timezone.utc).date()
+    if metadata is not None and _population_cache["date"] == today:
+        return
+
+    # Conditional GET: the data changes at most yearly
+    headers = {}
+    if metadata and metadata.get("source-etag"):
+        headers["If-None-Match"] = metadata["source-etag"]
+    if metadata and metadata.get("source-last-modified"):
+        headers["If-Modified-Since"] = metadata["source-last-modified"]
+
+    response = _HTTP.get(API_URL, headers=headers, timeout=30.0)
+    if response.status_code == 304:
+        _population_cache["date"] = today
+        return  # S3 copy is current
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+
     # Upload to S3
     s3.put_object(
         Bucket=bucket_name,
         Key=s3_key,
-        Body=json.dumps(data),
+        Body=orjson.dumps(data),
         ContentType="application/json",
+        Metadata={
+            "source-etag": response.headers.get("ETag", ""),
+            "source-last-modified": response.headers.get("Last-Modified", ""),
+        },
     )
 
+    _population_cache["date"] = today
+
+
+def remote_content_md5(headers: httpx.Headers) -> str | None:
+    """Return the remote ETag if it is a plain content MD5, otherwise None."""
+    etag = headers.get("ETag", "")
+    if etag.startswith("W/"):
+        return None  # weak ETags never identify exact bytes
+
+    etag = etag.strip('"')
+    return etag.lower() if MD5_HEX_RE.fullmatch(etag) else None
+
+
+def is_bls_file_current(
+    headers: httpx.Headers, content_md5: str | None, s3_obj: dict
+) -> bool:
+    """
+    Check from HEAD response headers whether the S3 copy of a BLS file is current.
+
+    Matches the remote content MD5 against the S3 ETag when the server
+    provides one; otherwise falls back to comparing Last-Modified with the
+    time the object was uploaded to S3.
+    """
+    if content_md5:
+        return content_md5 == s3_obj["etag"]
+
+    last_modified = headers.get("Last-Modified")
+    if not last_modified:
+        return False
+
+    try:
+        remote_mtime = parsedate_to_datetime(last_modified)
+        if remote_mtime.tzinfo is None:
+            remote_mtime = remote_mtime.replace(tzinfo=timezone.utc)  # "-0000"
+        return remote_mtime <= s3_obj["last_modified"]
+    except (TypeError, ValueError):
+        return False  # unparseable date: download to be safe
+
+
+def sync_bls_file(
+    s3,
+    bucket: str,
+    prefix: str,
+    filename: str,
+    bls_file: dict,
+    s3_obj: dict | None,
+) -> None:
+    """Download one BLS file and upload it to S3 if its content changed."""
+    url = bls_file["url"]
+    # The server-side MD5 (index.json or ETag) only decides whether to skip;
+    # it may be stale or not a real content MD5, so never upload against it.
+    remote_md5 = bls_file["md5"]
+
+    if remote_md5 is None:
+        head = _HTTP.head(url)
+        head.raise_for_status()
+        remote_md5 = remote_content_md5(head.headers)
+
+        if s3_obj is not None and is_bls_file_current(
+            head.headers, remote_md5, s3_obj
+        ):
+            return  # unchanged, skip the download entirely
+
+    elif s3_obj is not None and s3_obj["etag"] == remote_md5:
+        return  # unchanged per the server's index, no request needed
+
+    # Hash the bytes actually streamed; S3 verifies the upload against it.
+    md5 = hashlib.md5()
+
+    with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as buf:
+        with _HTTP.stream("GET", url) as r:
+            r.raise_for_status()
+            for chunk in r.iter_bytes(STREAM_CHUNK_SIZE):
+                md5.update(chunk)
+                buf.write(chunk)
+
+        if s3_obj is not None and s3_obj["etag"] == md5.hexdigest():
+            return  # unchanged
+
+        buf.seek(0)
+        s3.put_object(
+            Bucket=bucket,
+            Key=prefix + filename,
+            Body=buf,
+            ContentMD5=base64.b64encode(md5.digest()).decode(),
+        )
+
+    print(f"Uploaded/Updated: {filename}")
+
 
 def sync_bls_pr_to_s3(s3, bucket: str, prefix: str):
     """
@@ -150,18 +344,23 @@ def sync_bls_pr_to_s3(s3, bucket: str, prefix: str):
     s3_files = list_s3_objects(s3, bucket, prefix)
 
     # ---- Upload or update files ----
-    for filename, url in bls_files.items():
-        r = httpx.get(url, timeout=60)
-        r.raise_for_status()
-        content = r.content
-        content_md5 = md5_bytes(content)
-
-        if filename in s3_files and s3_files[filename] == content_md5:
-            continue  # unchanged
-
-        s3.put_object(Bucket=bucket, Key=prefix + filename, Body=BytesIO(content))
-
-        print(f"Uploaded/Updated: {filename}")
+    # Downloads are network-bound, so run them concurrently over the shared
+    # keep-alive connection pool instead of one full round-trip at a time.
+    with ThreadPoolExecutor(max_workers=MAX_SYNC_WORKERS) as pool:
+        futures = [
+            pool.submit(
+                sync_bls_file,
+                s3,
+                bucket,
+                prefix,
+                filename,
+                bls_file,
+                s3_files.get(filename),
+            )
+            for filename, bls_file in bls_files.items()
+        ]
+        for future in futures:
+            future.result()  # re-raise the first download/upload error
 
     # ---- Delete removed files ----
     for filename in s3_files:
@@ -173,14 +372,8 @@ def sync_bls_pr_to_s3(s3, bucket: str, prefix: str):
 
 
 def handler(event, context):
-    # 1. Initialize the S3 client using environment variables from docker-compose
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=os.environ.get("MINIO_ENDPOINT"),
-        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
-        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
-        region_name=os.environ.get("AWS_REGION") or "us-east-1",
-    )
+    # 1. Reuse the module-level S3 client (configured from docker-compose env)
+    s3 = _S3
 
     bucket_name = event.get("bucket-name") or "data"
     create_s3_bucket_if_not_exists(s3, bucket_name)
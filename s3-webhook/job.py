@@ -1,9 +1,9 @@
-import json
+import io
 import os
-from io import StringIO
-from typing import Dict
+from typing import BinaryIO, Dict
 
 import boto3
+import orjson
 import pandas as pd
 from botocore.exceptions import ClientError, NoCredentialsError
 from dotenv import find_dotenv, load_dotenv
@@ -17,6 +17,8 @@ S3_BUCKET = "data"
 
 POPULATION_OBJ_KEY = "population/honolulu_population_data.json"
 SERIES_OBJ_KEY = "pub/time.series/pr/pr.data.0.Current"
+SERIES_COLUMNS = ["series_id", "year", "period", "value"]
+SERIES_HEADER_PEEK_SIZE = 64 * 1024
 
 POPULATION_START_YEAR = 2013
 POPULATION_END_YEAR = 2018
@@ -51,11 +53,11 @@ def create_s3_client():
 # =========================
 
 
-def fetch_s3_object(s3, bucket: str, key: str) -> str:
-    """Fetch an object from S3 and return its content as a string."""
+def open_s3_stream(s3, bucket: str, key: str) -> BinaryIO:
+    """Open an object in S3 and return its streaming body (file-like)."""
     try:
         response = s3.get_object(Bucket=bucket, Key=key)
-        return response["Body"].read().decode("utf-8")
+        return response["Body"]
 
     except NoCredentialsError:
         raise RuntimeError("AWS credentials not found.")
@@ -69,9 +71,9 @@ def fetch_s3_object(s3, bucket: str, key: str) -> str:
 # =========================
 
 
-def load_population_dataframe(raw_json: str) -> pd.DataFrame:
+def load_population_dataframe(body: BinaryIO) -> pd.DataFrame:
     """Load population JSON into a cleaned Pandas DataFrame."""
-    population_data = json.loads(raw_json)["data"]
+    population_data = orjson.loads(body.read())["data"]
     df = pd.DataFrame(population_data)
 
     df["Population"] = pd.to_numeric(df["Population"])
@@ -97,24 +99,60 @@ def calculate_population_stats(
 # =========================
 
 
-def load_series_dataframe(raw_text: str) -> pd.DataFrame:
+def load_series_dataframe(body: BinaryIO) -> pd.DataFrame:
     """Load and clean time series TSV data."""
-    df = pd.read_csv(StringIO(raw_text), sep="\t")
+    # Peek at the header without consuming it: the BLS column names are
+    # space-padded, and the parser needs the exact names to skip the
+    # unused columns (footnote_codes) at read time.
+    stream = io.BufferedReader(body, buffer_size=SERIES_HEADER_PEEK_SIZE)
+    header, newline, _ = stream.peek(SERIES_HEADER_PEEK_SIZE).partition(b"\n")
+    if not newline:
+        raise RuntimeError("Series TSV header not found.")
+    padded = {
+        name.strip(): name for name in header.decode("utf-8").rstrip("\r").split("\t")
+    }
+
+    df = pd.read_csv(
+        stream,
+        sep="\t",
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+        usecols=[padded[name] for name in SERIES_COLUMNS],
+        dtype={
+            padded["series_id"]: "category",
+            padded["year"]: "int16",
+            padded["period"]: "category",
+        },
+    )
 
     df.columns = df.columns.str.strip()
-    df["series_id"] = df["series_id"].str.strip()
-    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+
+    # Strip the few hundred categories instead of every row
+    df["series_id"] = df["series_id"].cat.rename_categories(
+        df["series_id"].cat.categories.str.strip()
+    )
+    df["value"] = pd.to_numeric(df["value"], errors="coerce").astype("float64")
 
     return df
 
 
 def calculate_best_year_per_series(df: pd.DataFrame) -> pd.DataFrame:
     """Return the year with max summed value per series_id."""
-    yearly_sum = df.groupby(["series_id", "year"], as_index=False)["value"].sum()
-
-    return yearly_sum.loc[
-        yearly_sum.groupby("series_id")["value"].idxmax()
-    ].reset_index(drop=True)
+    # Plain pandas on purpose: the job runs this once per process, so a JIT
+    # kernel's compile/import cost outweighs the few ms this takes.
+    yearly_sum = df.groupby(
+        ["series_id", "year"], as_index=False, sort=False, observed=True
+    )["value"].sum()
+
+    # One stable sort instead of a second groupby + idxmax; ties keep the
+    # earliest year, matching idxmax.
+    return (
+        yearly_sum.sort_values(
+            ["series_id", "value", "year"], ascending=[True, False, True]
+        )
+        .drop_duplicates("series_id", keep="first")
+        .reset_index(drop=True)
+    )
 
 
 # =========================
@@ -126,19 +164,32 @@ def join_series_with_population(
     series_df: pd.DataFrame, population_df: pd.DataFrame
 ) -> pd.DataFrame:
     """Join series data with population by year."""
-    return series_df.merge(
-        population_df,
-        left_on="year",
-        right_on="Year",
-        how="inner",
+    # Population is a handful of rows; a dict lookup avoids a full merge.
+    population_by_year = dict(zip(population_df["Year"], population_df["Population"]))
+    population = series_df["year"].map(population_by_year)
+
+    # Keep inner-join semantics: drop years without population data.
+    matched = population.notna()
+    return series_df[matched].assign(
+        Population=population[matched].astype(population_df["Population"].dtype)
     )
 
 
 def filter_target_series(df: pd.DataFrame, series_id: str, period: str) -> pd.DataFrame:
     """Filter results for a specific series and period."""
-    return df[(df["series_id"] == series_id) & (df["period"] == period)][
-        ["series_id", "year", "period", "value", "Population"]
-    ]
+    columns = ["series_id", "year", "period", "value"]
+
+    # Compare the small integer category codes rather than the strings
+    sid_code = df["series_id"].cat.categories.get_indexer([series_id])[0]
+    per_code = df["period"].cat.categories.get_indexer([period])[0]
+    if sid_code < 0 or per_code < 0:
+        return df.loc[:, columns].iloc[:0]  # -1 would otherwise match NaN rows
+
+    mask = (df["series_id"].cat.codes.to_numpy() == sid_code) & (
+        df["period"].cat.codes.to_numpy() == per_code
+    )
+
+    return df.loc[mask, columns]
 
 
 # =========================
@@ -153,8 +204,8 @@ def main() -> None:
     s3 = create_s3_client()
 
     # --- Population ---
-    population_raw = fetch_s3_object(s3, S3_BUCKET, POPULATION_OBJ_KEY)
-    population_df = load_population_dataframe(population_raw)
+    population_body = open_s3_stream(s3, S3_BUCKET, POPULATION_OBJ_KEY)
+    population_df = load_population_dataframe(population_body)
 
     stats = calculate_population_stats(
         population_df,
@@ -167,19 +218,20 @@ def main() -> None:
     print(f"\tStandard deviation: {stats['std']:,.0f}")
 
     # --- Series ---
-    series_raw = fetch_s3_object(s3, S3_BUCKET, SERIES_OBJ_KEY)
-    series_df = load_series_dataframe(series_raw)
+    series_body = open_s3_stream(s3, S3_BUCKET, SERIES_OBJ_KEY)
+    series_df = load_series_dataframe(series_body)
 
     best_year_df = calculate_best_year_per_series(series_df)
     print(best_year_df)
 
-    # --- Join & Filter ---
-    joined_df = join_series_with_population(series_df, population_df)
-    final_results = filter_target_series(
-        joined_df,
+    # --- Filter & Join ---
+    # Filter first so population is only attached to the target rows.
+    target_df = filter_target_series(
+        series_df,
         TARGET_SERIES_ID,
         TARGET_PERIOD,
     )
+    final_results = join_series_with_population(target_df, population_df)
 
     print("\nFiltered Series Results:")
     print(final_results.to_string(index=False))
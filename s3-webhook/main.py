@@ -1,3 +1,4 @@
+import orjson
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -33,8 +34,9 @@ manager = ConnectionManager()
 # MinIO webhook
 # -------------------------------
 @app.post("/minio-webhook")
-async def minio_webhook(request: Request):
-    data = await request.json()
+async def minio_webhook(request: Request) -> dict[str, str]:
+    # Parse the raw body with orjson rather than Starlette's json.loads
+    data = orjson.loads(await request.body())
 
     for record in data.get("Records", []):
         bucket = record["s3"]["bucket"]["name"]